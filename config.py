@@ -8,6 +8,32 @@ load_dotenv()
 ALCHEMY_API_KEY = os.getenv('ALCHEMY_API_KEY')
 INFURA_PROJECT_ID = os.getenv('INFURA_PROJECT_ID')
 
+# Extra Alchemy keys (comma-separated) pooled with ALCHEMY_API_KEY
+ALCHEMY_API_KEYS = list(dict.fromkeys(
+    key.strip() for key in [ALCHEMY_API_KEY or ''] + os.getenv('ALCHEMY_API_KEYS', '').split(',') if key.strip()
+))
+
+# Requests per second allowed per provider key
+RPC_RATE_LIMIT = float(os.getenv('RPC_RATE_LIMIT', '5'))
+
+# RPC provider pool (Infura cannot serve alchemy_* methods)
+RPC_ENDPOINTS = [
+    {
+        'name': f"alchemy-{i}",
+        'url': f"https://eth-mainnet.alchemyapi.io/v2/{key}",
+        'rate_limit': RPC_RATE_LIMIT,
+        'alchemy_api': True
+    }
+    for i, key in enumerate(ALCHEMY_API_KEYS, 1)
+]
+if INFURA_PROJECT_ID:
+    RPC_ENDPOINTS.append({
+        'name': 'infura',
+        'url': f"https://mainnet.infura.io/v3/{INFURA_PROJECT_ID}",
+        'rate_limit': RPC_RATE_LIMIT,
+        'alchemy_api': False
+    })
+
 # Compound Protocol Addresses
 COMPOUND_V2_COMPTROLLER = "0x3d9819210A31b4961b30EF54bE2aeD79B9c9Cd3B"
 COMPOUND_V3_COMET_USDC = "0xc3d688B66703497DAA19211EEdff47f25384cdc3"
@@ -20,15 +46,54 @@ CTOKEN_ADDRESSES = {
     'cUSDT': '0xf650c3d88d12db855b8bf7d11be6c55a4e07dcc9'
 }
 
-# Risk Scoring Weights
-RISK_WEIGHTS = {
-    'repayment_score': 0.3,
-    'liquidation_score': 0.25,
-    'stability_score': 0.2,
-    'activity_score': 0.15,
-    'diversification_score': 0.1
+# Risk Scoring Rules
+# Each component maps a wallet feature onto points: a value below thresholds[0]
+# earns points[0], a value >= thresholds[i] earns points[i + 1]. Missing
+# features earn `missing` points (or points[0] when unset). The final score is
+# the weighted sum of all components, clipped to 0-1000.
+SCORING_RULES = {
+    'activity_score': {
+        'thresholds': [1, 5, 10, 20, 50],          # Compound transactions
+        'points': [50, 80, 120, 160, 200, 250],
+        'weight': 1.0
+    },
+    'volume_score': {
+        'thresholds': [100, 1000, 10000, 100000, 1000000],  # USD volume
+        'points': [50, 80, 110, 140, 170, 200],
+        'weight': 1.0
+    },
+    'experience_score': {
+        'thresholds': [1, 2, 3, 4],                # Years since first Compound tx
+        'points': [70, 110, 140, 170, 200],
+        'missing': 50,
+        'weight': 1.0
+    },
+    'diversification_score': {
+        'thresholds': [2, 3, 5, 8],                # Unique tokens
+        'points': [30, 60, 90, 120, 150],
+        'weight': 1.0
+    },
+    'consistency_score': {
+        'thresholds': [0.05, 0.1, 0.2, 0.5],       # Compound / total transactions
+        'points': [60, 80, 120, 160, 200],
+        'missing': 50,
+        'weight': 1.0
+    }
 }
 
+# Reference date used to measure wallet experience
+SCORING_REFERENCE_DATE = "2024-01-01"
+
+# Optional JSON file overriding SCORING_RULES (reloaded on demand)
+SCORING_RULES_PATH = os.getenv('SCORING_RULES_PATH')
+
+# Transfer history paging for alchemy_getAssetTransfers
+TRANSFERS_PAGE_SIZE = 1000
+MAX_TRANSFER_PAGES = 5
+
+# Parallel workers used for batch extraction
+EXTRACTION_WORKERS = int(os.getenv('EXTRACTION_WORKERS', '4'))
+
 # File paths
 WALLETS_CSV_PATH = "data/raw/wallets.csv"
 OUTPUT_CSV_PATH = "output/wallet_risk_scores.csv"
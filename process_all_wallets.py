@@ -1,14 +1,31 @@
 import pandas as pd
 import sys
 import os
-import time
 from datetime import datetime
 
 # Add src directory to path
 sys.path.append('src')
+import config
 from data_extraction import CompoundDataExtractor
+from scheduler import estimate_wallet_costs, estimate_makespan, run_scheduled
 
-def process_all_wallets():
+def extract_wallet(extractor, wallet):
+    """Extract one wallet, turning failures into an error entry"""
+    try:
+        # Rate limiting is handled by the extractor's shared RPC pool
+        return extractor.extract_wallet_data(wallet)
+        
+    except Exception as e:
+        print(f"❌ Error processing {wallet}: {e}")
+        # Add error entry to maintain order
+        return {
+            'wallet_address': wallet,
+            'total_transactions': 0,
+            'compound_transactions': 0,
+            'error': str(e)
+        }
+
+def process_all_wallets(max_workers=config.EXTRACTION_WORKERS):
     """Process all wallets and extract their data"""
     
     print("🚀 Starting batch processing of all wallets...")
@@ -17,40 +34,37 @@ def process_all_wallets():
     df = pd.read_csv('data/raw/wallets.csv')
     wallets = df['wallet_id'].tolist()
     
-    print(f"📊 Processing {len(wallets)} wallets...")
+    print(f"📊 Processing {len(wallets)} wallets with {max_workers} workers...")
     
-    # Initialize extractor
+    # Estimate per-wallet cost from the previous run so heavy wallets start first
+    costs = estimate_wallet_costs(wallets)
+    plan = estimate_makespan(costs, max_workers)
+    print(f"🗓️ Estimated makespan: {plan['makespan']:.0f} page requests (lower bound {plan['lower_bound']:.1f})")
+    
+    # Initialize extractor - all workers share its RPC pool, so the request
+    # rate per key stays capped however many workers run
     extractor = CompoundDataExtractor()
     
-    # Store results
-    all_results = []
+    # Results in completion order, for progress saves
+    completed = []
     
-    # Process each wallet
-    for i, wallet in enumerate(wallets, 1):
-        print(f"\n[{i}/{len(wallets)}] Processing wallet: {wallet[:10]}...")
+    def save_progress(wallet, result):
+        completed.append(result)
         
-        try:
-            result = extractor.extract_wallet_data(wallet)
-            all_results.append(result)
-            
-            # Save progress every 10 wallets
-            if i % 10 == 0:
-                temp_df = pd.DataFrame(all_results)
-                temp_df.to_csv('data/processed/temp_wallet_data.csv', index=False)
-                print(f"💾 Progress saved: {i}/{len(wallets)} wallets processed")
-            
-            # Rate limiting - be nice to the API
-            time.sleep(1)
-            
-        except Exception as e:
-            print(f"❌ Error processing {wallet}: {e}")
-            # Add error entry to maintain order
-            all_results.append({
-                'wallet_address': wallet,
-                'total_transactions': 0,
-                'compound_transactions': 0,
-                'error': str(e)
-            })
+        # Save progress every 10 wallets
+        if len(completed) % 10 == 0:
+            temp_df = pd.DataFrame(completed)
+            temp_df.to_csv('data/processed/temp_wallet_data.csv', index=False)
+            print(f"💾 Progress saved: {len(completed)}/{len(wallets)} wallets processed")
+    
+    # Process wallets longest-first across workers, results back in CSV order
+    all_results = run_scheduled(
+        wallets,
+        lambda wallet: extract_wallet(extractor, wallet),
+        costs,
+        max_workers=max_workers,
+        on_result=save_progress
+    )
     
     # Save final results
     final_df = pd.DataFrame(all_results)
@@ -89,7 +103,6 @@ def process_sample_wallets(n=5):
         try:
             result = extractor.extract_wallet_data(wallet)
             results.append(result)
-            time.sleep(1)  # Rate limiting
             
         except Exception as e:
             print(f"❌ Error: {e}")
@@ -1,6 +1,4 @@
-import requests
 import pandas as pd
-import time
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import sys
@@ -10,14 +8,18 @@ import os
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(parent_dir)
 
+# Add this directory too so sibling modules import when loaded as src.data_extraction
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
 import config
+from rpc_pool import RPCProviderPool
 
 class CompoundDataExtractor:
-    def __init__(self):
-        self.alchemy_url = f"https://eth-mainnet.alchemyapi.io/v2/{config.ALCHEMY_API_KEY}"
+    def __init__(self, pool: Optional[RPCProviderPool] = None):
+        self.pool = pool or RPCProviderPool()
         self.ctoken_addresses = [addr.lower() for addr in config.CTOKEN_ADDRESSES.values()]
         
-    def get_wallet_transactions(self, wallet_address: str, max_pages: int = 5) -> List[Dict]:
+    def get_wallet_transactions(self, wallet_address: str, max_pages: int = config.MAX_TRANSFER_PAGES) -> List[Dict]:
         """Get all transactions for a wallet address"""
         print(f"📥 Fetching transactions for {wallet_address[:10]}...")
         
@@ -35,7 +37,7 @@ class CompoundDataExtractor:
                     "category": ["external", "internal", "erc20", "erc721", "erc1155"],
                     "withMetadata": True,
                     "excludeZeroValue": False,
-                    "maxCount": "0x3e8"  # 1000 transactions per page
+                    "maxCount": hex(config.TRANSFERS_PAGE_SIZE)  # Transactions per page
                 }],
                 "id": 1
             }
@@ -43,33 +45,26 @@ class CompoundDataExtractor:
             if page_key:
                 payload["params"][0]["pageKey"] = page_key
                 
+            # Pool handles routing, rate limiting and failover; a failed page
+            # raises so a truncated history is never saved as complete
             try:
-                response = requests.post(self.alchemy_url, json=payload)
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    if 'result' in result:
-                        transfers = result['result']['transfers']
-                        all_transactions.extend(transfers)
-                        
-                        # Check if there are more pages
-                        if 'pageKey' in result['result']:
-                            page_key = result['result']['pageKey']
-                        else:
-                            break
-                    else:
-                        print(f"❌ No result in response: {result}")
-                        break
-                else:
-                    print(f"❌ HTTP error {response.status_code}")
-                    break
-                    
+                result = self.pool.request(payload)
             except Exception as e:
                 print(f"❌ Error fetching transactions: {e}")
+                raise
+            
+            if 'result' not in result:
+                print(f"❌ No result in response: {result}")
+                raise RuntimeError(f"Incomplete transfer history for {wallet_address}: {result.get('error', result)}")
+            
+            transfers = result['result']['transfers']
+            all_transactions.extend(transfers)
+            
+            # Check if there are more pages
+            if 'pageKey' in result['result']:
+                page_key = result['result']['pageKey']
+            else:
                 break
-                
-            # Rate limiting
-            time.sleep(0.2)
             
         print(f"✅ Found {len(all_transactions)} total transactions")
         return all_transactions
@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import json
 import sys
 import os
 
@@ -10,143 +12,232 @@ sys.path.append(parent_dir)
 
 import config
 
+# Wallet feature each scoring component is bucketed on
+COMPONENT_FEATURES = {
+    'activity_score': 'compound_transactions',
+    'volume_score': 'total_volume',
+    'experience_score': 'years_active',
+    'diversification_score': 'unique_tokens',
+    'consistency_score': 'compound_ratio'
+}
+
+def merge_rules(base: Dict, overrides: Optional[Dict] = None) -> Dict:
+    """Overlay per-component rule overrides onto a base rule set"""
+    merged = {name: dict(rule) for name, rule in base.items()}
+    
+    for name, rule in (overrides or {}).items():
+        if name not in COMPONENT_FEATURES:
+            raise ValueError(f"Unknown scoring component: {name}")
+        merged.setdefault(name, {}).update(rule)
+    
+    return merged
+
+def compile_rules(rules: Dict) -> Dict[str, Dict[str, Any]]:
+    """Validate a rule set and compile it into numpy lookup arrays"""
+    tables = {}
+    
+    for name in COMPONENT_FEATURES:
+        if name not in rules:
+            raise ValueError(f"Missing rules for component: {name}")
+        
+        rule = rules[name]
+        thresholds = np.asarray(rule['thresholds'], dtype=float)
+        points = np.asarray(rule['points'], dtype=float)
+        
+        if len(points) != len(thresholds) + 1:
+            raise ValueError(f"{name}: expected {len(thresholds) + 1} point values, got {len(points)}")
+        if np.any(np.diff(thresholds) <= 0):
+            raise ValueError(f"{name}: thresholds must be strictly increasing")
+        
+        tables[name] = {
+            'thresholds': thresholds,
+            'points': points,
+            'missing': float(rule.get('missing', points[0])),
+            'weight': float(rule.get('weight', 1.0))
+        }
+    
+    return tables
+
+def load_scoring_rules(path: Optional[str] = None) -> Dict:
+    """Load scoring rules from a JSON file, falling back to config defaults"""
+    path = path or config.SCORING_RULES_PATH
+    
+    if not path:
+        return merge_rules(config.SCORING_RULES)
+    
+    with open(path) as f:
+        return merge_rules(config.SCORING_RULES, json.load(f))
+
+def years_active(first_transaction, reference_date: str = config.SCORING_REFERENCE_DATE):
+    """Years between the first transaction(s) and the reference date (NaN when unknown)"""
+    if isinstance(first_transaction, pd.Series):
+        return np.array([years_active(value, reference_date) for value in first_transaction], dtype=float)
+    
+    if pd.isna(first_transaction) or first_transaction is None:
+        return np.nan
+    
+    # Extracted timestamps are tz-aware, so subtracting them from the naive
+    # reference raises and scores as missing. Kept as-is for score parity:
+    # changing it recalibrates every published score.
+    try:
+        # Parse the timestamp
+        first_date = pd.to_datetime(first_transaction)
+        current_date = pd.to_datetime(reference_date)
+        
+        return (current_date - first_date).days / 365.25
+        
+    except:
+        return np.nan  # Error parsing = treated as missing
+
 class WalletRiskScorer:
-    def __init__(self):
-        self.weights = config.RISK_WEIGHTS
+    def __init__(self, rules: Optional[Dict] = None):
+        self.reload_rules(rules)
+    
+    def reload_rules(self, rules: Optional[Dict] = None):
+        """(Re)load and compile scoring rules without restarting"""
+        if rules is None:
+            rules = load_scoring_rules()
         
-    def calculate_activity_score(self, row):
-        """Calculate activity-based risk score (0-250 points)"""
-        compound_txs = row['compound_transactions']
+        self.rules = merge_rules(config.SCORING_RULES, rules)
+        self.tables = compile_rules(self.rules)
+    
+    def _lookup(self, component: str, value) -> int:
+        """Map a single feature value onto points for a component"""
+        table = self.tables[component]
+        
+        if pd.isna(value):
+            return int(table['missing'])
+        
+        bucket = np.searchsorted(table['thresholds'], value, side='right')
+        return int(table['points'][bucket])
         
+    def calculate_activity_score(self, row):
+        """Calculate activity-based risk score (points from SCORING_RULES)"""
         # More transactions = lower risk (higher score)
-        if compound_txs == 0:
-            return 50  # No activity = high risk
-        elif compound_txs >= 50:
-            return 250  # Very active = low risk
-        elif compound_txs >= 20:
-            return 200
-        elif compound_txs >= 10:
-            return 160
-        elif compound_txs >= 5:
-            return 120
-        else:
-            return 80  # Low activity = higher risk
+        return self._lookup('activity_score', row['compound_transactions'])
     
     def calculate_diversification_score(self, row):
-        """Calculate diversification score (0-150 points)"""
-        unique_tokens = row['unique_tokens']
-        
+        """Calculate diversification score (points from SCORING_RULES)"""
         # More token diversity = lower risk (higher score)
-        if unique_tokens >= 8:
-            return 150
-        elif unique_tokens >= 5:
-            return 120
-        elif unique_tokens >= 3:
-            return 90
-        elif unique_tokens >= 2:
-            return 60
-        else:
-            return 30  # Single token = higher risk
+        return self._lookup('diversification_score', row['unique_tokens'])
     
     def calculate_volume_score(self, row):
-        """Calculate volume-based score (0-200 points)"""
-        volume = row['total_volume']
-        
+        """Calculate volume-based score (points from SCORING_RULES)"""
         # Higher volume users tend to be more sophisticated (lower risk)
-        if volume >= 1000000:  # $1M+
-            return 200
-        elif volume >= 100000:  # $100K+
-            return 170
-        elif volume >= 10000:   # $10K+
-            return 140
-        elif volume >= 1000:    # $1K+
-            return 110
-        elif volume >= 100:     # $100+
-            return 80
-        else:
-            return 50  # Very low volume = higher risk
+        return self._lookup('volume_score', row['total_volume'])
     
     def calculate_experience_score(self, row):
-        """Calculate experience score based on transaction history (0-200 points)"""
-        first_tx = row['first_transaction']
-        
-        if pd.isna(first_tx) or first_tx is None:
-            return 50  # No history = higher risk
-        
-        try:
-            # Parse the timestamp
-            first_date = pd.to_datetime(first_tx)
-            current_date = pd.to_datetime('2024-01-01')  # Use a reference date
-            
-            # Calculate years of experience
-            years = (current_date - first_date).days / 365.25
-            
-            if years >= 4:
-                return 200  # Very experienced = low risk
-            elif years >= 3:
-                return 170
-            elif years >= 2:
-                return 140
-            elif years >= 1:
-                return 110
-            else:
-                return 70  # New user = higher risk
-                
-        except:
-            return 50  # Error parsing = higher risk
+        """Calculate experience score based on transaction history (points from SCORING_RULES)"""
+        # No history or unparseable timestamp = higher risk
+        return self._lookup('experience_score', years_active(row['first_transaction']))
     
     def calculate_consistency_score(self, row):
-        """Calculate consistency score (0-200 points)"""
+        """Calculate consistency score (points from SCORING_RULES)"""
         compound_txs = row['compound_transactions']
         total_txs = row['total_transactions']
         
-        if total_txs == 0:
-            return 50
+        # Ratio of compound to total transactions (no transactions = missing)
+        compound_ratio = compound_txs / total_txs if total_txs > 0 else np.nan
         
-        # Ratio of compound to total transactions
-        compound_ratio = compound_txs / total_txs
-        
-        if compound_ratio >= 0.5:
-            return 200  # Very focused on DeFi = lower risk
-        elif compound_ratio >= 0.2:
-            return 160
-        elif compound_ratio >= 0.1:
-            return 120
-        elif compound_ratio >= 0.05:
-            return 80
-        else:
-            return 60  # Occasional DeFi user
+        return self._lookup('consistency_score', compound_ratio)
     
     def calculate_wallet_risk_score(self, row):
         """Calculate overall risk score for a wallet (0-1000)"""
         
         # Calculate individual component scores
-        activity_score = self.calculate_activity_score(row)
-        diversification_score = self.calculate_diversification_score(row)
-        volume_score = self.calculate_volume_score(row)
-        experience_score = self.calculate_experience_score(row)
-        consistency_score = self.calculate_consistency_score(row)
-        
-        # Sum all components (max possible = 1000)
-        total_score = (
-            activity_score +          # Max 250
-            volume_score +            # Max 200  
-            experience_score +        # Max 200
-            diversification_score +   # Max 150
-            consistency_score         # Max 200
-        )
+        scores = {
+            'activity_score': self.calculate_activity_score(row),
+            'volume_score': self.calculate_volume_score(row),
+            'experience_score': self.calculate_experience_score(row),
+            'diversification_score': self.calculate_diversification_score(row),
+            'consistency_score': self.calculate_consistency_score(row)
+        }
+        
+        # Weighted sum of all components
+        total_score = sum(self.tables[name]['weight'] * points for name, points in scores.items())
         
         # Ensure score is between 0 and 1000
         final_score = max(0, min(1000, int(total_score)))
         
-        return {
-            'score': final_score,
-            'activity_score': activity_score,
-            'volume_score': volume_score,
-            'experience_score': experience_score,
-            'diversification_score': diversification_score,
-            'consistency_score': consistency_score
+        return {'score': final_score, **scores}
+    
+    def compute_features(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Compute the feature vector each component is scored on"""
+        compound_txs = df['compound_transactions'].to_numpy(dtype=float)
+        total_txs = df['total_transactions'].to_numpy(dtype=float)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            compound_ratio = np.where(total_txs > 0, compound_txs / total_txs, np.nan)
+        
+        features = {
+            'compound_transactions': compound_txs,
+            'total_volume': df['total_volume'].to_numpy(dtype=float),
+            'years_active': years_active(df['first_transaction']),
+            'unique_tokens': df['unique_tokens'].to_numpy(dtype=float),
+            'compound_ratio': compound_ratio
         }
+        
+        return {name: features[feature] for name, feature in COMPONENT_FEATURES.items()}
+    
+    def _component_points(self, features: Dict[str, np.ndarray], tables: List[Dict]) -> Dict[str, np.ndarray]:
+        """Points per component as (rule sets x wallets) matrices"""
+        points_by_component = {}
+        
+        for name, values in features.items():
+            rule_tables = [t[name] for t in tables]
+            width = max(len(t['thresholds']) for t in rule_tables)
+            
+            # Pad ragged tables so every rule set shares one lookup matrix
+            thresholds = np.full((len(tables), width), np.inf)
+            points = np.empty((len(tables), width + 1))
+            for k, table in enumerate(rule_tables):
+                n = len(table['thresholds'])
+                thresholds[k, :n] = table['thresholds']
+                points[k, :n + 1] = table['points']
+                points[k, n + 1:] = table['points'][-1]
+            missing = np.array([t['missing'] for t in rule_tables])
+            
+            buckets = (values[None, :, None] >= thresholds[:, None, :]).sum(axis=2)
+            component_points = np.take_along_axis(points, buckets, axis=1)
+            points_by_component[name] = np.where(np.isnan(values)[None, :], missing[:, None], component_points)
+        
+        return points_by_component
+    
+    def score_batch(self, df: pd.DataFrame, rule_sets) -> pd.DataFrame:
+        """Score N wallets against K rule sets at once
+        
+        rule_sets is a list or a {name: rules} dict; each entry overrides the
+        scorer's current rules per component. Returns a wallets x rule sets
+        DataFrame of final scores.
+        """
+        if isinstance(rule_sets, dict):
+            names, rule_sets = list(rule_sets.keys()), list(rule_sets.values())
+        else:
+            names = list(range(len(rule_sets)))
+        
+        if not rule_sets:
+            raise ValueError("score_batch needs at least one rule set")
+        
+        tables = [compile_rules(merge_rules(self.rules, rules)) for rules in rule_sets]
+        points = self._component_points(self.compute_features(df), tables)
+        
+        weights = {name: np.array([t[name]['weight'] for t in tables]) for name in points}
+        totals = sum(weights[name][:, None] * points[name] for name in points)
+        scores = np.clip(totals, 0, 1000).astype(int)
+        
+        return pd.DataFrame(scores.T, index=df['wallet_address'].to_numpy(), columns=names)
+    
+    def score_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Score every wallet in a DataFrame with the current rules"""
+        points = self._component_points(self.compute_features(df), [self.tables])
+        
+        results = pd.DataFrame({'wallet_id': df['wallet_address'].to_numpy()})
+        totals = sum(self.tables[name]['weight'] * points[name][0] for name in points)
+        results['score'] = np.clip(totals, 0, 1000).astype(int)
+        for name, component_points in points.items():
+            results[name] = component_points[0].astype(int)
+        
+        return results
     
     def score_all_wallets(self, data_file='data/processed/all_wallet_data.csv'):
         """Score all wallets and return results"""
@@ -158,29 +249,7 @@ class WalletRiskScorer:
         
         print(f"📊 Scoring {len(df)} wallets...")
         
-        results = []
-        
-        for idx, row in df.iterrows():
-            wallet_address = row['wallet_address']
-            
-            # Calculate risk scores
-            scores = self.calculate_wallet_risk_score(row)
-            
-            # Prepare result
-            result = {
-                'wallet_id': wallet_address,
-                'score': scores['score']
-            }
-            
-            # Add detailed scores for analysis
-            result.update(scores)
-            
-            results.append(result)
-            
-            if (idx + 1) % 20 == 0:
-                print(f"✅ Scored {idx + 1}/{len(df)} wallets...")
-        
-        results_df = pd.DataFrame(results)
+        results_df = self.score_frame(df)
         
         print(f"✅ Risk scoring complete!")
         
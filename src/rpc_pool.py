@@ -0,0 +1,180 @@
+import requests
+import threading
+import time
+from typing import Any, Dict, List, Optional
+import sys
+import os
+
+# Add parent directory to path so we can import config
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+import config
+
+# JSON-RPC error codes providers use for rate limiting
+RATE_LIMIT_ERROR_CODES = {429, -32005}
+
+# HTTP statuses worth retrying on another endpoint (plus any 5xx)
+RETRYABLE_STATUS_CODES = {429}
+
+class RPCPoolError(Exception):
+    """Raised when no provider in the pool could serve a request"""
+
+class RPCRequestError(RPCPoolError):
+    """Raised for client errors (4xx) that retrying cannot fix"""
+
+class RPCEndpoint:
+    """One provider endpoint with a token-bucket rate limit and health stats"""
+
+    def __init__(self, name: str, url: str, rate_limit: float = 5.0, alchemy_api: bool = False):
+        if rate_limit <= 0:
+            raise ValueError(f"{name}: rate_limit must be > 0, got {rate_limit}")
+
+        self.name = name
+        self.url = url
+        self.rate_limit = float(rate_limit)
+        self.alchemy_api = alchemy_api
+
+        self.tokens = self.rate_limit
+        self.last_refill = time.monotonic()
+        self.latency = None         # EWMA of successful request latency (seconds)
+        self.failures = 0
+        self.cooldown_until = 0.0
+        self.requests = 0
+
+    def supports(self, method: str) -> bool:
+        """Alchemy-specific methods only work on Alchemy endpoints"""
+        return self.alchemy_api or not method.startswith('alchemy_')
+
+    def refill(self, now: float):
+        self.tokens = min(self.rate_limit, self.tokens + (now - self.last_refill) * self.rate_limit)
+        self.last_refill = now
+
+    def available(self, now: float) -> bool:
+        return now >= self.cooldown_until and self.tokens >= 1
+
+    def cost(self, default_latency: float) -> float:
+        """Lower is better: latency scaled up by recent failures and as free capacity runs out
+
+        Endpoints that have never answered use default_latency, so they are
+        never preferred just because nothing has been measured.
+        """
+        latency = self.latency if self.latency is not None else default_latency
+        return latency * (1 + self.failures) / (self.tokens / self.rate_limit)
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until this endpoint can take another request"""
+        refill_wait = max(0.0, (1 - self.tokens) / self.rate_limit)
+        return max(self.cooldown_until - now, refill_wait)
+
+class RPCProviderPool:
+    """Route JSON-RPC requests across several providers/API keys
+
+    Each request goes to the healthy endpoint with the most free capacity and
+    lowest latency. Failed endpoints are cooled down with exponential backoff
+    and the request fails over (or waits out the cooldown) until max_attempts
+    is used up, so throughput adds up across keys.
+    """
+
+    def __init__(self, endpoints: Optional[List[Dict]] = None,
+                 timeout: float = 30.0, latency_alpha: float = 0.3,
+                 max_cooldown: float = 30.0, max_attempts: int = 6):
+        endpoints = config.RPC_ENDPOINTS if endpoints is None else endpoints
+        self.endpoints = [RPCEndpoint(**spec) for spec in endpoints]
+        self.timeout = timeout
+        self.latency_alpha = latency_alpha
+        self.max_cooldown = max_cooldown
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+
+    def _acquire(self, method: str) -> Optional[RPCEndpoint]:
+        """Reserve a request slot on the best endpoint, waiting for capacity if needed"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                candidates = [e for e in self.endpoints if e.supports(method)]
+                if not candidates:
+                    return None
+
+                for endpoint in candidates:
+                    endpoint.refill(now)
+
+                ready = [e for e in candidates if e.available(now)]
+                if ready:
+                    default_latency = self._mean_latency()
+                    best = min(ready, key=lambda e: (e.cost(default_latency), e.failures, -e.tokens))
+                    best.tokens -= 1
+                    best.requests += 1
+                    return best
+
+                wait = min(e.wait_time(now) for e in candidates)
+
+            time.sleep(wait)
+
+    def _mean_latency(self) -> float:
+        """Mean measured latency across the pool (neutral value for unmeasured endpoints)"""
+        measured = [e.latency for e in self.endpoints if e.latency is not None]
+        return sum(measured) / len(measured) if measured else 1.0
+
+    def _record_success(self, endpoint: RPCEndpoint, latency: float):
+        with self.lock:
+            if endpoint.latency is None:
+                endpoint.latency = latency
+            else:
+                endpoint.latency += self.latency_alpha * (latency - endpoint.latency)
+            endpoint.failures = 0
+
+    def _record_failure(self, endpoint: RPCEndpoint):
+        with self.lock:
+            endpoint.failures += 1
+            backoff = min(self.max_cooldown, 2 ** (endpoint.failures - 1))
+            endpoint.cooldown_until = time.monotonic() + backoff
+
+    def request(self, payload: Dict) -> Dict[str, Any]:
+        """Send a JSON-RPC payload, failing over between endpoints on errors"""
+        method = payload.get('method', '')
+        last_error = None
+
+        for _ in range(self.max_attempts):
+            endpoint = self._acquire(method)
+            if endpoint is None:
+                raise RPCPoolError(f"No RPC endpoint configured for {method}")
+
+            start = time.monotonic()
+            try:
+                response = requests.post(endpoint.url, json=payload, timeout=self.timeout)
+                if response.status_code in RETRYABLE_STATUS_CODES or response.status_code >= 500:
+                    raise RPCPoolError(f"HTTP error {response.status_code}")
+
+                if response.status_code != 200:
+                    # Client errors fail the same way everywhere: don't retry or penalise the key
+                    raise RPCRequestError(f"{endpoint.name}: HTTP error {response.status_code}")
+
+                result = response.json()
+                error = result.get('error') if isinstance(result, dict) else None
+                if error and error.get('code') in RATE_LIMIT_ERROR_CODES:
+                    raise RPCPoolError("rate limited")
+
+            except RPCRequestError:
+                raise
+
+            except (requests.ConnectionError, requests.Timeout, ValueError, RPCPoolError) as e:
+                # Transient failures cool down; the next attempt routes elsewhere or waits
+                self._record_failure(endpoint)
+                last_error = f"{endpoint.name}: {e}"
+                continue
+
+            self._record_success(endpoint, time.monotonic() - start)
+            return result
+
+        raise RPCPoolError(f"All RPC attempts failed for {method} after {self.max_attempts} tries ({last_error})")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-endpoint request counts, latency and health"""
+        with self.lock:
+            return [{
+                'name': e.name,
+                'requests': e.requests,
+                'latency': e.latency,
+                'failures': e.failures
+            } for e in self.endpoints]
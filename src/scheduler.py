@@ -0,0 +1,81 @@
+import heapq
+import math
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+# Add parent directory to path so we can import config
+parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(parent_dir)
+
+import config
+
+def estimate_wallet_costs(wallets: List[str],
+                          history_file: str = 'data/processed/all_wallet_data.csv',
+                          page_size: int = config.TRANSFERS_PAGE_SIZE,
+                          max_pages: int = config.MAX_TRANSFER_PAGES,
+                          wallet_overhead: float = 0.0) -> Dict[str, float]:
+    """Estimate extraction cost per wallet from a previous run
+
+    Cost is in relative units of one API page request: the expected page
+    count plus an optional fixed per-wallet overhead. Rate limiting lives in
+    the RPC pool, so a wallet does no other work besides its page requests.
+    """
+    history = {}
+
+    if os.path.exists(history_file):
+        past = pd.read_csv(history_file)
+        for wallet, total_txs in zip(past['wallet_address'], past['total_transactions']):
+            if pd.notna(total_txs):
+                history[wallet.lower()] = min(max_pages, max(1, math.ceil(total_txs / page_size)))
+
+    # Unseen wallets get the median known page count (one page if there is no history)
+    default_pages = float(pd.Series(list(history.values())).median()) if history else 1.0
+
+    return {
+        wallet: wallet_overhead + history.get(wallet.lower(), default_pages)
+        for wallet in wallets
+    }
+
+def longest_first(costs: Dict[str, float]) -> List[str]:
+    """Order wallets by descending estimated cost (LPT dispatch order)"""
+    return sorted(costs, key=lambda wallet: costs[wallet], reverse=True)
+
+def estimate_makespan(costs: Dict[str, float], n_workers: int) -> Dict[str, float]:
+    """Simulate longest-first dispatch and compare it to the theoretical lower bound"""
+    loads = [0.0] * max(1, n_workers)
+    heapq.heapify(loads)
+
+    for wallet in longest_first(costs):
+        heapq.heappush(loads, heapq.heappop(loads) + costs[wallet])
+
+    total = sum(costs.values())
+    lower_bound = max(total / max(1, n_workers), max(costs.values(), default=0.0))
+
+    return {'makespan': max(loads), 'lower_bound': lower_bound}
+
+def run_scheduled(wallets: List[str],
+                  job: Callable[[str], Any],
+                  costs: Dict[str, float],
+                  max_workers: int = 4,
+                  on_result: Optional[Callable[[str, Any], None]] = None) -> List[Any]:
+    """Run job for every wallet, heaviest first, and return results in input order
+
+    Jobs are queued longest-first, so each idle worker picks up the largest
+    remaining wallet and small wallets fill the tail of the run.
+    """
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(job, wallet): wallet for wallet in longest_first(costs)}
+
+        for future in as_completed(futures):
+            wallet = futures[future]
+            results[wallet] = future.result()
+            if on_result:
+                on_result(wallet, results[wallet])
+
+    return [results[wallet] for wallet in wallets]
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import sys
+
+sys.path.append('src')
+from risk_scoring import WalletRiskScorer
+
+# Ragged calibration: more activity buckets, fewer volume buckets, non-unit weights
+RAGGED_RULES = {
+    'activity_score': {
+        'thresholds': [1, 2, 5, 10, 20, 50, 100],
+        'points': [0, 10, 80, 120, 160, 200, 250, 300],
+        'weight': 0.5
+    },
+    'volume_score': {
+        'thresholds': [1000],
+        'points': [20, 180],
+        'weight': 1.5
+    },
+    'consistency_score': {
+        'missing': 5
+    }
+}
+
+def edge_case_wallets():
+    """Wallets covering NaN features and zero-transaction ratios"""
+    return pd.DataFrame([
+        {'wallet_address': '0xa', 'total_transactions': 3379, 'compound_transactions': 40,
+         'first_transaction': '2019-09-02T19:09:07.000Z', 'unique_tokens': 8, 'total_volume': 14553269.5},
+        {'wallet_address': '0xb', 'total_transactions': 0, 'compound_transactions': 0,
+         'first_transaction': np.nan, 'unique_tokens': np.nan, 'total_volume': np.nan},
+        {'wallet_address': '0xc', 'total_transactions': 4, 'compound_transactions': 2,
+         'first_transaction': '2021-06-01', 'unique_tokens': 2, 'total_volume': 1000.0},
+        {'wallet_address': '0xd', 'total_transactions': 150, 'compound_transactions': 150,
+         'first_transaction': 'not a date', 'unique_tokens': 1, 'total_volume': 99.9},
+    ])
+
+def row_scores(scorer, df):
+    """Reference scores from the per-row calculate_* methods"""
+    return pd.DataFrame([
+        {'wallet_id': row['wallet_address'], **scorer.calculate_wallet_risk_score(row)}
+        for _, row in df.iterrows()
+    ])
+
+def test_score_frame_matches_committed_output():
+    df = pd.read_csv('data/processed/all_wallet_data.csv')
+    scorer = WalletRiskScorer(rules={})
+
+    frame = scorer.score_frame(df)
+    committed = pd.read_csv('data/processed/detailed_risk_scores.csv')
+
+    assert (frame.values == committed[frame.columns].values).all()
+    assert (frame.values == row_scores(scorer, df)[frame.columns].values).all()
+
+def test_score_frame_matches_row_scoring_on_edge_cases():
+    df = edge_case_wallets()
+
+    for rules in [{}, RAGGED_RULES]:
+        scorer = WalletRiskScorer(rules=rules)
+        frame = scorer.score_frame(df)
+        assert (frame.values == row_scores(scorer, df)[frame.columns].values).all()
+
+def test_score_batch_matches_row_scoring_per_rule_set():
+    df = edge_case_wallets()
+    scorer = WalletRiskScorer(rules={})
+
+    batch = scorer.score_batch(df, {'baseline': {}, 'ragged': RAGGED_RULES})
+
+    for name, rules in [('baseline', {}), ('ragged', RAGGED_RULES)]:
+        expected = row_scores(WalletRiskScorer(rules=rules), df)['score']
+        assert batch[name].tolist() == expected.tolist()
+
+def test_missing_features_use_missing_points():
+    df = edge_case_wallets()
+    frame = WalletRiskScorer(rules=RAGGED_RULES).score_frame(df)
+    empty_wallet = frame.iloc[1]
+
+    assert empty_wallet['consistency_score'] == 5      # zero transactions -> missing
+    assert empty_wallet['experience_score'] == 50      # no first transaction -> missing
+    assert empty_wallet['volume_score'] == 20          # NaN volume -> lowest bucket
+    assert empty_wallet['diversification_score'] == 30
+
+def test_score_batch_rejects_empty_rule_sets():
+    df = edge_case_wallets()
+
+    try:
+        WalletRiskScorer(rules={}).score_batch(df, [])
+    except ValueError:
+        return
+    raise AssertionError("score_batch accepted an empty rule set list")
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,138 @@
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+sys.path.append('src')
+from rpc_pool import RPCProviderPool, RPCPoolError, RPCRequestError
+
+PAYLOAD = {"jsonrpc": "2.0", "method": "eth_blockNumber", "params": [], "id": 1}
+
+@contextmanager
+def mock_endpoints(*responders):
+    """Start local JSON-RPC mocks; each responder maps call number -> (status, body)"""
+    servers = []
+    urls = []
+
+    for responder in responders:
+        calls = {'n': 0}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self, responder=responder, calls=calls):
+                self.rfile.read(int(self.headers['Content-Length']))
+                calls['n'] += 1
+                status, body = responder(calls['n'])
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                self.wfile.write(body.encode())
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        urls.append(f"http://127.0.0.1:{server.server_port}")
+
+    try:
+        yield urls
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+def ok(call):
+    return 200, json.dumps({'jsonrpc': '2.0', 'id': 1, 'result': '0x1'})
+
+def always(status):
+    return lambda call: (status, json.dumps({'jsonrpc': '2.0', 'id': 1, 'error': {'code': status}}))
+
+def endpoint(name, url, rate_limit=10):
+    return {'name': name, 'url': url, 'rate_limit': rate_limit, 'alchemy_api': True}
+
+def by_name(pool):
+    return {stat['name']: stat for stat in pool.stats()}
+
+def test_load_splits_across_keys_and_skips_broken_endpoint():
+    with mock_endpoints(ok, ok, always(503)) as urls:
+        pool = RPCProviderPool([
+            endpoint('healthy-1', urls[0]),
+            endpoint('healthy-2', urls[1]),
+            endpoint('broken', urls[2])
+        ])
+
+        start = time.monotonic()
+        for _ in range(40):
+            assert pool.request(PAYLOAD)['result'] == '0x1'
+        elapsed = time.monotonic() - start
+
+    stats = by_name(pool)
+    assert abs(stats['healthy-1']['requests'] - stats['healthy-2']['requests']) <= 2
+    assert stats['broken']['requests'] == 1
+    assert stats['broken']['failures'] == 1
+
+    # One 10/s key needs ~3s for 40 requests; two keys together need ~1s
+    assert elapsed < 1.8
+
+def test_transient_429_is_retried_on_single_endpoint():
+    with mock_endpoints(lambda call: always(429)(call) if call == 1 else ok(call)) as urls:
+        pool = RPCProviderPool([endpoint('only', urls[0])])
+        result = pool.request(PAYLOAD)
+
+    assert result['result'] == '0x1'
+    stats = by_name(pool)
+    assert stats['only']['requests'] == 2
+    assert stats['only']['failures'] == 0
+
+def test_client_error_raises_without_retry_or_cooldown():
+    with mock_endpoints(always(400)) as urls:
+        pool = RPCProviderPool([endpoint('only', urls[0])])
+
+        start = time.monotonic()
+        try:
+            pool.request(PAYLOAD)
+        except RPCRequestError:
+            pass
+        else:
+            raise AssertionError("400 response did not raise")
+        elapsed = time.monotonic() - start
+
+    assert elapsed < 0.5
+    assert by_name(pool)['only']['requests'] == 1
+    assert pool.endpoints[0].failures == 0
+    assert pool.endpoints[0].cooldown_until == 0.0
+
+def test_failing_endpoint_not_preferred_after_cooldown():
+    with mock_endpoints(always(503), ok) as urls:
+        pool = RPCProviderPool([endpoint('failing', urls[0], 100), endpoint('healthy', urls[1], 100)])
+
+        pool.request(PAYLOAD)
+        time.sleep(1.1)  # failing endpoint's cooldown has expired
+        for _ in range(5):
+            pool.request(PAYLOAD)
+
+    stats = by_name(pool)
+    assert stats['failing']['requests'] == 1
+    assert stats['healthy']['requests'] == 6
+
+def test_retries_are_bounded():
+    with mock_endpoints(always(503)) as urls:
+        pool = RPCProviderPool([endpoint('only', urls[0])], max_attempts=2)
+
+        try:
+            pool.request(PAYLOAD)
+        except RPCPoolError:
+            pass
+        else:
+            raise AssertionError("pool did not give up after max_attempts")
+
+    assert by_name(pool)['only']['requests'] == 2
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f"✅ {name}")